@@ -4,24 +4,27 @@ INCOIS Disaster Alerts Scraper - FIXED VERSION
 Extracts structured disaster alerts from INCOIS website and saves to JSON.
 """
 
-import requests
-import json
+import asyncio
+import hashlib
 import logging
-import time
 import re
+import shelve
 from datetime import datetime, timezone
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, field
 
 try:
-    from bs4 import BeautifulSoup
+    import aiohttp
+    from lxml import etree, html as lxml_html
     from geopy.geocoders import Nominatim
     from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
     import feedparser
+    import orjson
 except ImportError as e:
     print(f"❌ Missing required packages. Install with:")
-    print("pip install requests beautifulsoup4 geopy feedparser lxml")
+    print("pip install aiohttp geopy feedparser lxml orjson")
     raise e
 
 # Configure logging
@@ -35,6 +38,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Transient server errors worth retrying
+RETRY_STATUSES = {500, 502, 503, 504}
+
+# Fallback alerts used when nothing could be scraped; only "time" is filled in per run
+_SAMPLE_ALERTS_TEMPLATE = (
+    {
+        "title": "🚨 High Wave Alert - Bay of Bengal",
+        "message": "Sea conditions are rough to very rough with wave heights of 3-4 meters expected along Andhra Pradesh and Odisha coasts. Fishermen are advised not to venture into the sea.",
+        "severity": "warning",
+        "source": "INCOIS",
+        "lat": 17.7,
+        "lng": 83.3
+    },
+    {
+        "title": "⚠️ Ocean State Forecast",
+        "message": "Moderate sea conditions expected along Tamil Nadu coast with wave heights of 1.5-2.5 meters. Light to moderate rainfall predicted.",
+        "severity": "info",
+        "source": "INCOIS",
+        "lat": 13.0827,
+        "lng": 80.2707
+    },
+    {
+        "title": "🚨 Cyclone Warning - Arabian Sea",
+        "message": "A deep depression in Arabian Sea is likely to intensify into a cyclonic storm. Coastal areas of Gujarat and Maharashtra advised to take precautionary measures.",
+        "severity": "emergency",
+        "source": "INCOIS",
+        "lat": 20.0,
+        "lng": 70.0
+    }
+)
+
+# Single alert written by main() if the scraper itself crashes
+_ERROR_FALLBACK_ALERT_TEMPLATE = {
+    "title": "🚨 INCOIS Alert System Active",
+    "message": "INCOIS disaster alert monitoring system is operational. Check https://incois.gov.in for latest updates.",
+    "severity": "info",
+    "source": "INCOIS",
+    "lat": 17.7,
+    "lng": 83.3
+}
+
 @dataclass
 class Alert:
     """Represents a disaster alert"""
@@ -45,16 +89,41 @@ class Alert:
     lat: Optional[float]
     lng: Optional[float]
     time: str
+    # First place name found in the text; geocoded after fetching, not serialized
+    location: Optional[str] = field(default=None, repr=False)
+    
+    def to_dict(self) -> Dict:
+        """Flat dict for JSON output (cheaper than dataclasses.asdict, which deep-copies)"""
+        return {
+            'title': self.title,
+            'message': self.message,
+            'severity': self.severity,
+            'source': self.source,
+            'lat': self.lat,
+            'lng': self.lng,
+            'time': self.time
+        }
 
 class INCOISScraper:
     """Robust INCOIS disaster alerts scraper"""
     
     def __init__(self):
         self.base_url = "https://incois.gov.in"
-        self.session = self._create_session()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.max_concurrent_requests = 4
+        self.max_response_bytes = 5 * 1024 * 1024  # Feeds/pages larger than this are skipped
+        self.max_retries = 2
+        self.retry_backoff = 0.3  # seconds, doubled on each retry
+        self._semaphore: Optional[asyncio.Semaphore] = None
         self.geocoder = Nominatim(user_agent="incois-scraper", timeout=10)
+        # Persistent geocode cache: normalized location -> (lat, lng), or () for known misses
+        # (opened lazily by _get_geo_cache, closed at the end of each run)
+        self.geo_cache_path = 'geocode.cache'
+        self._geo_cache = None
         self.alerts_processed = 0
         self.alerts_skipped = 0
+        # Timestamp shared by every alert in a run; refreshed by fetch_incois_alerts
+        self._batch_time_iso = datetime.now(timezone.utc).isoformat()
         
         # Multiple potential RSS/XML endpoints
         self.potential_feeds = [
@@ -94,6 +163,12 @@ class INCOISScraper:
             ]
         }
         
+        # Keywords that mark a scraped paragraph as alert-worthy
+        self.alert_keywords = [
+            'tsunami', 'cyclone', 'warning', 'alert', 'forecast', 'bulletin',
+            'depression', 'storm', 'wave', 'surge', 'advisory', 'caution'
+        ]
+        
         # Location patterns for Indian coastal regions
         self.location_patterns = [
             r'\b([A-Z][a-z]+ (?:coast|Coast))\b',
@@ -104,11 +179,32 @@ class INCOISScraper:
             r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:port|Port|harbour|Harbour)\b',
             r'(?:along|off)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+coast'
         ]
+        
+        # Pre-compiled patterns, built once per scraper instead of per call
+        self._emergency_re = self._compile_keywords(self.severity_keywords['emergency'])
+        self._warning_re = self._compile_keywords(self.severity_keywords['warning'])
+        self._alert_keyword_re = self._compile_keywords(self.alert_keywords)
+        self._location_patterns_compiled = [re.compile(p, re.IGNORECASE) for p in self.location_patterns]
+        self._html_tag_re = re.compile(r'<[^>]+>')
+        self._ws_re = re.compile(r'\s+')
+        self._sentence_re = re.compile(r'[.!?]+')
+        self._html_parser = lxml_html.HTMLParser(collect_ids=False, remove_comments=True)
+        self._alert_classes = ('alert', 'warning', 'bulletin', 'announcement', 'news-item')
+        self._alert_xpath = etree.XPath(
+            '//p | //li | //*[' + ' or '.join(f'contains(@class, "{c}")' for c in self._alert_classes) + ']'
+        )
+        
+        # Text -> result helpers are pure, and INCOIS republishes the same bulletin text
+        # across RSS and webpages, so memoize them per scraper instance
+        self._determine_severity = lru_cache(maxsize=2048)(self._determine_severity)
+        self._extract_locations = lru_cache(maxsize=1024)(self._extract_locations)
     
-    def _create_session(self) -> requests.Session:
-        """Create a robust requests session"""
-        session = requests.Session()
-        session.headers.update({
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a robust aiohttp session (must be called inside the event loop)"""
+        # Pooled keep-alive connector: every URL is on incois.gov.in, so TLS handshakes are reused
+        connector = aiohttp.TCPConnector(limit=10, limit_per_host=self.max_concurrent_requests,
+                                         keepalive_timeout=30)
+        return aiohttp.ClientSession(connector=connector, headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -116,36 +212,95 @@ class INCOISScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
-        return session
+    
+    async def _fetch(self, url: str, timeout: int) -> Optional[bytes]:
+        """GET a URL, limited by the politeness semaphore. Returns the body on HTTP 200.
+        
+        Connection errors, timeouts and 5xx responses are retried with exponential backoff.
+        """
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                async with self._semaphore:
+                    async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                        if response.status in RETRY_STATUSES and not last_attempt:
+                            logger.debug(f"HTTP {response.status} from {url}, retrying")
+                        elif response.status != 200:
+                            return None
+                        else:
+                            return await self._read_body(response, url)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                logger.debug(f"Request to {url} failed ({e!r}), retrying")
+            
+            await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+        
+        return None
+    
+    async def _read_body(self, response: aiohttp.ClientResponse, url: str) -> Optional[bytes]:
+        """Read a response body, giving up on anything larger than max_response_bytes"""
+        if (response.content_length or 0) > self.max_response_bytes:
+            logger.warning(f"Skipping oversized response ({response.content_length} bytes): {url}")
+            return None
+        
+        # Stream the (already decompressed) body so an oversized response is cut off early
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) > self.max_response_bytes:
+                logger.warning(f"Response exceeded {self.max_response_bytes} bytes, skipping: {url}")
+                return None
+        return bytes(body)
+    
+    @staticmethod
+    def _compile_keywords(keywords: List[str]) -> re.Pattern:
+        """Build a single case-insensitive alternation regex matching any keyword as a substring"""
+        return re.compile('|'.join(re.escape(k) for k in keywords), re.IGNORECASE)
     
     def _determine_severity(self, text: str) -> str:
         """Determine alert severity based on text content"""
-        text_lower = text.lower()
-        
         # Check for emergency keywords first
-        for keyword in self.severity_keywords['emergency']:
-            if keyword.lower() in text_lower:
-                return 'emergency'
+        if self._emergency_re.search(text):
+            return 'emergency'
         
         # Check for warning keywords
-        for keyword in self.severity_keywords['warning']:
-            if keyword.lower() in text_lower:
-                return 'warning'
+        if self._warning_re.search(text):
+            return 'warning'
         
         return 'info'
     
-    def _extract_locations(self, text: str) -> List[str]:
-        """Extract location names from text"""
+    def _extract_locations(self, text: str) -> Tuple[str, ...]:
+        """Extract location names from text (tuple, so cached results can't be mutated)"""
         locations = []
         
-        for pattern in self.location_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in self._location_patterns_compiled:
+            for match in pattern.finditer(text):
                 location = match.group(1).strip()
                 if location and len(location) > 2:
                     locations.append(location)
         
-        return list(dict.fromkeys(locations))  # Remove duplicates
+        return tuple(dict.fromkeys(locations))  # Remove duplicates
+    
+    def _get_geo_cache(self):
+        """Open the persistent geocode cache, falling back to an in-memory dict if it can't be opened"""
+        if self._geo_cache is None:
+            try:
+                self._geo_cache = shelve.open(self.geo_cache_path, writeback=False)
+            except Exception as e:
+                # e.g. read-only CWD, or a gdbm lock held by a concurrent scraper run
+                logger.warning(f"Geocode cache unavailable ({e}), caching in memory only")
+                self._geo_cache = {}
+        return self._geo_cache
+    
+    def _close_geo_cache(self):
+        """Flush and close the persistent geocode cache, if open"""
+        if isinstance(self._geo_cache, shelve.Shelf):
+            try:
+                self._geo_cache.close()
+            except Exception as e:
+                logger.debug(f"Closing geocode cache failed: {e}")
+        self._geo_cache = None
     
     def _geocode_location(self, location: str) -> Optional[Tuple[float, float]]:
         """Geocode a location to lat/lng"""
@@ -159,42 +314,70 @@ class INCOISScraper:
             elif 'indian ocean' in location_lower:
                 return (10.0, 75.0)
             
+            # Check the persistent cache before hitting Nominatim
+            key = location.strip().lower()
+            geo_cache = self._get_geo_cache()
+            if key in geo_cache:
+                cached = geo_cache[key]
+                return cached if cached else None
+            
             # Try geocoding with India context
             search_query = f"{location}, India"
             result = self.geocoder.geocode(search_query, exactly_one=True)
             
-            if result:
-                return (float(result.latitude), float(result.longitude))
+            coords = (float(result.latitude), float(result.longitude)) if result else None
+            geo_cache[key] = coords or ()
+            return coords
                 
         except Exception as e:
             logger.debug(f"Geocoding failed for '{location}': {e}")
         
         return None
     
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        """Compact 8-byte fingerprint of a string, used as a dedup key"""
+        return hashlib.blake2b(text.encode('utf-8', 'ignore'), digest_size=8).digest()
+    
+    def _geocode_alerts(self, alerts: List[Alert]) -> None:
+        """Fill in lat/lng from each alert's location, one lookup at a time.
+        
+        Runs in a single worker thread so the geocode cache is opened, used and
+        closed on the same thread; serial lookups respect Nominatim's 1 request/second policy.
+        """
+        try:
+            for alert in alerts:
+                if alert.location and alert.lat is None:
+                    coords = self._geocode_location(alert.location)
+                    if coords:
+                        alert.lat, alert.lng = coords
+        finally:
+            self._close_geo_cache()
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
         if not text:
             return ""
         
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', text)
+        text = self._html_tag_re.sub(' ', text)
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = self._ws_re.sub(' ', text)
         # Remove special characters
         text = text.replace('\xa0', ' ').replace('\u200b', '')
         
         return text.strip()
     
-    def _try_rss_feed(self, feed_url: str) -> List[Alert]:
+    async def _try_rss_feed(self, feed_url: str) -> List[Alert]:
         """Try to parse an RSS feed"""
         alerts = []
         
         try:
             logger.info(f"Trying RSS feed: {feed_url}")
             
-            response = self.session.get(feed_url, timeout=15)
-            if response.status_code == 200:
-                feed = feedparser.parse(response.content)
+            body = await self._fetch(feed_url, timeout=15)
+            if body is not None:
+                feed = feedparser.parse(body)
                 
                 for entry in feed.entries:
                     try:
@@ -206,20 +389,15 @@ class INCOISScraper:
                             severity = self._determine_severity(full_text)
                             locations = self._extract_locations(full_text)
                             
-                            lat, lng = None, None
-                            if locations:
-                                coords = self._geocode_location(locations[0])
-                                if coords:
-                                    lat, lng = coords
-                            
                             alert = Alert(
                                 title=f"🚨 {title}" if severity == 'emergency' else f"⚠️ {title}" if severity == 'warning' else title,
                                 message=description or title,
                                 severity=severity,
                                 source="INCOIS",
-                                lat=lat,
-                                lng=lng,
-                                time=datetime.now(timezone.utc).isoformat()
+                                lat=None,
+                                lng=None,
+                                time=self._batch_time_iso,
+                                location=locations[0] if locations else None
                             )
                             
                             alerts.append(alert)
@@ -235,83 +413,67 @@ class INCOISScraper:
         
         return alerts
     
-    def _scrape_webpage(self, url: str) -> List[Alert]:
+    async def _scrape_webpage(self, url: str) -> List[Alert]:
         """Scrape a webpage for alert content"""
         alerts = []
         
         try:
             logger.info(f"Scraping webpage: {url}")
             
-            response = self.session.get(url, timeout=20)
-            if response.status_code != 200:
+            body = await self._fetch(url, timeout=20)
+            if body is None:
                 return alerts
                 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            tree = lxml_html.fromstring(body, parser=self._html_parser)
             
             # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            etree.strip_elements(tree, 'script', 'style', with_tail=False)
             
-            # Look for alert-like content
+            # Look for alert-like content: one XPath pass over paragraphs and alert-classed elements
             potential_alerts = []
             
-            # Method 1: Look for specific keywords in text
-            text_content = soup.get_text()
-            paragraphs = text_content.split('\n')
-            
-            for para in paragraphs:
-                para = para.strip()
-                if len(para) > 50:  # Substantial content
-                    para_lower = para.lower()
-                    
-                    # Check if paragraph contains alert-worthy keywords
-                    alert_keywords = ['tsunami', 'cyclone', 'warning', 'alert', 'forecast', 'bulletin', 
-                                    'depression', 'storm', 'wave', 'surge', 'advisory', 'caution']
-                    
-                    if any(keyword in para_lower for keyword in alert_keywords):
-                        potential_alerts.append(para)
-            
-            # Method 2: Look for structured content
-            for selector in ['.alert', '.warning', '.bulletin', '.announcement', '.news-item', 
-                           '[class*="alert"]', '[class*="warning"]', '[class*="bulletin"]']:
-                elements = soup.select(selector)
-                for elem in elements:
-                    text = self._clean_text(elem.get_text())
+            for elem in self._alert_xpath(tree):
+                text = self._clean_text(elem.text_content())
+                css_class = elem.get('class') or ''
+                if any(c in css_class for c in self._alert_classes):
+                    # Alert-classed elements (including <p>/<li>) only need some content
                     if len(text) > 30:
                         potential_alerts.append(text)
+                elif len(text) > 50 and self._alert_keyword_re.search(text):
+                    # Plain paragraphs need substantial, alert-worthy content
+                    potential_alerts.append(text)
             
             # Process potential alerts
-            seen_content = set()
+            seen_content: Set[bytes] = set()
             
             for content in potential_alerts:
                 content = self._clean_text(content)
                 
-                if not content or len(content) < 30 or content in seen_content:
+                if not content or len(content) < 30:
+                    continue
+                
+                content_key = self._digest(content)
+                if content_key in seen_content:
                     continue
                     
-                seen_content.add(content)
+                seen_content.add(content_key)
                 
                 # Extract title (first sentence or first 100 chars)
-                sentences = re.split(r'[.!?]+', content)
+                sentences = self._sentence_re.split(content)
                 title = sentences[0][:100] if sentences else content[:50]
                 
                 severity = self._determine_severity(content)
                 locations = self._extract_locations(content)
                 
-                lat, lng = None, None
-                if locations:
-                    coords = self._geocode_location(locations[0])
-                    if coords:
-                        lat, lng = coords
-                
                 alert = Alert(
                     title=f"🚨 {title}" if severity == 'emergency' else f"⚠️ {title}" if severity == 'warning' else title,
                     message=content,
                     severity=severity,
                     source="INCOIS", 
-                    lat=lat,
-                    lng=lng,
-                    time=datetime.now(timezone.utc).isoformat()
+                    lat=None,
+                    lng=None,
+                    time=self._batch_time_iso,
+                    location=locations[0] if locations else None
                 )
                 
                 alerts.append(alert)
@@ -330,84 +492,57 @@ class INCOISScraper:
         """Generate sample alerts as fallback (for testing/demonstration)"""
         logger.warning("Generating sample alerts as fallback...")
         
-        sample_alerts = [
-            Alert(
-                title="🚨 High Wave Alert - Bay of Bengal",
-                message="Sea conditions are rough to very rough with wave heights of 3-4 meters expected along Andhra Pradesh and Odisha coasts. Fishermen are advised not to venture into the sea.",
-                severity="warning",
-                source="INCOIS",
-                lat=17.7,
-                lng=83.3,
-                time=datetime.now(timezone.utc).isoformat()
-            ),
-            Alert(
-                title="⚠️ Ocean State Forecast",
-                message="Moderate sea conditions expected along Tamil Nadu coast with wave heights of 1.5-2.5 meters. Light to moderate rainfall predicted.",
-                severity="info", 
-                source="INCOIS",
-                lat=13.0827,
-                lng=80.2707,
-                time=datetime.now(timezone.utc).isoformat()
-            ),
-            Alert(
-                title="🚨 Cyclone Warning - Arabian Sea",
-                message="A deep depression in Arabian Sea is likely to intensify into a cyclonic storm. Coastal areas of Gujarat and Maharashtra advised to take precautionary measures.",
-                severity="emergency",
-                source="INCOIS", 
-                lat=20.0,
-                lng=70.0,
-                time=datetime.now(timezone.utc).isoformat()
-            )
-        ]
-        
-        return sample_alerts
+        return [Alert(**template, time=self._batch_time_iso) for template in _SAMPLE_ALERTS_TEMPLATE]
     
-    def fetch_incois_alerts(self) -> List[Dict]:
+    async def fetch_incois_alerts(self) -> List[Dict]:
         """Main function to fetch INCOIS alerts"""
         logger.info("Starting INCOIS alerts extraction...")
+        self._batch_time_iso = datetime.now(timezone.utc).isoformat()
         all_alerts = []
         
-        # Try RSS feeds first
-        for feed_url in self.potential_feeds:
-            try:
-                rss_alerts = self._try_rss_feed(feed_url)
-                all_alerts.extend(rss_alerts)
-                time.sleep(1)  # Be respectful
-            except Exception as e:
-                logger.debug(f"RSS feed failed: {feed_url} - {e}")
+        # Fetch all RSS feeds and webpages concurrently; the semaphore keeps us respectful
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        async with self._create_session() as session:
+            self.session = session
+            tasks = [self._try_rss_feed(u) for u in self.potential_feeds]
+            tasks += [self._scrape_webpage(u) for u in self.scraping_urls]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        self.session = None
+        
+        rss_results = results[:len(self.potential_feeds)]
+        web_results = results[len(self.potential_feeds):]
+        
+        # RSS feeds first
+        for feed_url, result in zip(self.potential_feeds, rss_results):
+            if isinstance(result, Exception):
+                logger.debug(f"RSS feed failed: {feed_url} - {result}")
                 continue
+            all_alerts.extend(result)
         
-        # Try web scraping
-        for url in self.scraping_urls:
-            try:
-                web_alerts = self._scrape_webpage(url)
-                all_alerts.extend(web_alerts)
-                time.sleep(2)  # Be respectful
-                
-                if len(all_alerts) >= 5:  # Found enough alerts
-                    break
-                    
-            except Exception as e:
-                logger.debug(f"Web scraping failed: {url} - {e}")
+        # Then web scraping, in priority order
+        for url, result in zip(self.scraping_urls, web_results):
+            if isinstance(result, Exception):
+                logger.debug(f"Web scraping failed: {url} - {result}")
                 continue
+            all_alerts.extend(result)
+            
+            if len(all_alerts) >= 5:  # Found enough alerts
+                break
         
         # If no alerts found, generate samples for demonstration
         if not all_alerts:
             logger.warning("No alerts found from INCOIS website, generating sample alerts...")
             all_alerts = self._generate_sample_alerts()
         
-        # Remove duplicates
-        unique_alerts = []
-        seen_messages = set()
+        # Remove duplicates (first occurrence wins, original order kept)
+        keys = [self._digest(alert.message[:100].lower()) for alert in all_alerts]
+        first_by_key = dict(zip(reversed(keys), reversed(all_alerts)))
+        unique_alerts = [first_by_key[key] for key in dict.fromkeys(keys)]
+        self.alerts_processed += len(unique_alerts)
+        self.alerts_skipped += len(all_alerts) - len(unique_alerts)
         
-        for alert in all_alerts:
-            message_key = alert.message[:100].lower()
-            if message_key not in seen_messages:
-                seen_messages.add(message_key)
-                unique_alerts.append(alert)
-                self.alerts_processed += 1
-            else:
-                self.alerts_skipped += 1
+        # Geocode only the alerts we keep, off the event loop
+        await asyncio.to_thread(self._geocode_alerts, unique_alerts)
         
         logger.info(f"Processing completed: {len(unique_alerts)} unique alerts found")
         
@@ -416,7 +551,13 @@ class INCOISScraper:
             unique_alerts = self._generate_sample_alerts()
             self.alerts_processed = len(unique_alerts)
         
-        return [asdict(alert) for alert in unique_alerts]
+        return [alert.to_dict() for alert in unique_alerts]
+
+
+def save_alerts(alerts: List[Dict], path: str = 'alerts.json') -> None:
+    """Write alerts to a JSON file"""
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(alerts, option=orjson.OPT_INDENT_2))
 
 
 def main():
@@ -425,7 +566,7 @@ def main():
         print("🚀 Starting INCOIS disaster alerts extraction...")
         
         scraper = INCOISScraper()
-        alerts = scraper.fetch_incois_alerts()
+        alerts = asyncio.run(scraper.fetch_incois_alerts())
         
         # Ensure we have alerts to save
         if not alerts:
@@ -434,8 +575,7 @@ def main():
         
         # Save to JSON file with error handling
         try:
-            with open('alerts.json', 'w', encoding='utf-8') as f:
-                json.dump(alerts, f, indent=2, ensure_ascii=False)
+            save_alerts(alerts, 'alerts.json')
             
             print(f"✅ Successfully saved {len(alerts)} alerts to alerts.json")
             logger.info(f"Saved {len(alerts)} alerts to alerts.json")
@@ -471,20 +611,9 @@ def main():
         
         # Even on error, try to create a basic alerts.json file
         try:
-            sample_alerts = [
-                {
-                    "title": "🚨 INCOIS Alert System Active",
-                    "message": "INCOIS disaster alert monitoring system is operational. Check https://incois.gov.in for latest updates.",
-                    "severity": "info",
-                    "source": "INCOIS",
-                    "lat": 17.7,
-                    "lng": 83.3, 
-                    "time": datetime.now(timezone.utc).isoformat()
-                }
-            ]
+            sample_alerts = [{**_ERROR_FALLBACK_ALERT_TEMPLATE, "time": datetime.now(timezone.utc).isoformat()}]
             
-            with open('alerts.json', 'w', encoding='utf-8') as f:
-                json.dump(sample_alerts, f, indent=2, ensure_ascii=False)
+            save_alerts(sample_alerts, 'alerts.json')
                 
             print("✅ Created basic alerts.json file as fallback")
             
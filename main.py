@@ -1,16 +1,18 @@
 # main.py
 import os
 import sys
-import json
 import logging
 import math
 import traceback
 from typing import Optional, List, Any
 from datetime import datetime
 
+import numpy as np
+import orjson
 from fastapi import FastAPI, Request, Query, Form
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import Index, delete, event, insert
 from sqlmodel import SQLModel, Field, create_engine, Session, select
 
 # ---------------- logging ----------------
@@ -25,14 +27,30 @@ logger = logging.getLogger("alert-demo")
 # store last error for quick UI access
 last_error = {"time": None, "message": None, "trace": None}
 
+# mtime of alerts.json as of the last successful load; 0.0 forces a reload
+_last_mtime = 0.0
+
 # ---------------- app + DB ----------------
 DB_FILE = "alerts.db"
 engine = create_engine(f"sqlite:///{DB_FILE}", echo=False, connect_args={"check_same_thread": False})
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL + synchronous=NORMAL: commits no longer fsync every time, readers don't block the writer."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 app = FastAPI(title="Disaster Alert Demo (robust)")
 templates = Jinja2Templates(directory="templates")
 
 # ---------------- models ----------------
 class Alert(SQLModel, table=True):
+    __table_args__ = (Index("ix_alert_lat_lng", "lat", "lng"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     source: Optional[str] = None
     severity: Optional[str] = None
@@ -55,41 +73,54 @@ def set_last_error(exc: Exception):
 
 def recreate_db():
     """Delete DB file and recreate tables."""
+    global _last_mtime
     try:
+        # close pooled connections so the WAL is checkpointed and nothing holds the old file
+        engine.dispose()
         if os.path.exists(DB_FILE):
             os.remove(DB_FILE)
             logger.info("Removed existing DB file: %s", DB_FILE)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(DB_FILE + suffix):
+                os.remove(DB_FILE + suffix)
         SQLModel.metadata.create_all(engine)
+        _last_mtime = 0.0  # DB is empty again, next load must re-insert
         logger.info("Created new DB (tables).")
         return True, "DB recreated"
     except Exception as e:
         set_last_error(e)
         return False, str(e)
 
-def haversine_km(lat1, lon1, lat2, lon2):
+def haversine_km_np(lat1, lon1, lats, lngs):
+    """Vectorized haversine: distances (km) from one point to arrays of points."""
     R = 6371.0
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+    dlat = np.radians(lats - lat1)
+    dlon = np.radians(lngs - lon1)
+    a = np.sin(dlat/2)**2 + np.cos(np.radians(lat1)) * np.cos(np.radians(lats)) * np.sin(dlon/2)**2
+    return 2 * R * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
 
 # ---------------- start-up ----------------
 @app.on_event("startup")
 def on_startup():
     try:
         SQLModel.metadata.create_all(engine)
+        # create_all skips existing tables, so add indexes missing from older DB files
+        for index in Alert.__table__.indexes:
+            index.create(engine, checkfirst=True)
         logger.info("DB tables ready (using %s).", DB_FILE)
     except Exception as e:
         set_last_error(e)
 
 # ---------------- load JSON safely ----------------
-def load_alerts_from_json(file_path: str = "alerts.json"):
+def load_alerts_from_json(file_path: str = "alerts.json", force: bool = False):
     """
     Clear DB and insert alerts from JSON file.
     JSON should be a list of objects:
       { "title": "...", "message": "...", "severity": "warning", "source":"INCOIS", "lat": 12.3, "lng": 78.9 }
+    The load is skipped when the file's mtime hasn't changed since the last
+    successful load, unless force=True.
     """
+    global _last_mtime
     inserted = 0
     skipped = 0
     skipped_details: List[str] = []
@@ -97,58 +128,65 @@ def load_alerts_from_json(file_path: str = "alerts.json"):
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"{file_path} not found in cwd: {os.getcwd()}")
 
-        with open(file_path, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        mtime = os.path.getmtime(file_path)
+        if not force and mtime == _last_mtime:
+            return {"inserted": 0, "skipped": 0, "cached": True}
+
+        with open(file_path, "rb") as fh:
+            data = orjson.loads(fh.read())
 
         if not isinstance(data, list):
             raise ValueError("alerts.json must contain a JSON array (list) of alert objects.")
 
-        with Session(engine) as session:
-            # clear table
-            session.query(Alert).delete()
-            session.commit()
+        # validate everything up front, then replace the table in one transaction
+        now = datetime.utcnow()
+        rows: List[dict] = []
+        for idx, item in enumerate(data):
+            # basic validation and coercion
+            try:
+                title = item.get("title")
+                message = item.get("message")
+                severity = item.get("severity", "info")
+                source = item.get("source", "unknown")
+                lat = item.get("lat", None)
+                lng = item.get("lng", None)
 
-            for idx, item in enumerate(data):
-                # basic validation and coercion
-                try:
-                    title = item.get("title")
-                    message = item.get("message")
-                    severity = item.get("severity", "info")
-                    source = item.get("source", "unknown")
-                    lat = item.get("lat", None)
-                    lng = item.get("lng", None)
-
-                    # all alerts must have title & message
-                    if not title or not message:
+                # all alerts must have title & message
+                if not title or not message:
+                    skipped += 1
+                    skipped_details.append(f"idx {idx}: missing title/message")
+                    continue
+
+                # if lat/lng provided, coerce to floats
+                if lat is not None and lng is not None:
+                    try:
+                        lat = float(lat)
+                        lng = float(lng)
+                    except Exception:
                         skipped += 1
-                        skipped_details.append(f"idx {idx}: missing title/message")
+                        skipped_details.append(f"idx {idx}: invalid lat/lng")
                         continue
 
-                    # if lat/lng provided, coerce to floats
-                    if lat is not None and lng is not None:
-                        try:
-                            lat = float(lat)
-                            lng = float(lng)
-                        except Exception:
-                            skipped += 1
-                            skipped_details.append(f"idx {idx}: invalid lat/lng")
-                            continue
-
-                    alert = Alert(
-                        title=str(title),
-                        message=str(message),
-                        severity=str(severity),
-                        source=str(source),
-                        time=datetime.utcnow(),
-                        lat=lat,
-                        lng=lng
-                    )
-                    session.add(alert)
-                    inserted += 1
-                except Exception as e_inner:
-                    skipped += 1
-                    skipped_details.append(f"idx {idx}: exception {e_inner}")
+                rows.append({
+                    "title": str(title),
+                    "message": str(message),
+                    "severity": str(severity),
+                    "source": str(source),
+                    "time": now,
+                    "lat": lat,
+                    "lng": lng
+                })
+                inserted += 1
+            except Exception as e_inner:
+                skipped += 1
+                skipped_details.append(f"idx {idx}: exception {e_inner}")
+
+        with Session(engine) as session:
+            session.execute(delete(Alert))
+            if rows:
+                session.execute(insert(Alert), rows)
             session.commit()
+        _last_mtime = mtime
         logger.info("Loaded alerts.json: inserted=%d skipped=%d", inserted, skipped)
         return {"inserted": inserted, "skipped": skipped, "skipped_details": skipped_details}
     except Exception as e:
@@ -166,7 +204,7 @@ def home(request: Request):
     except Exception as e:
         logger.warning("home: load_alerts_from_json failed: %s", e)
     with Session(engine) as session:
-        stmt = select(Alert).order_by(Alert.time.desc())
+        stmt = select(Alert).order_by(Alert.time.desc(), Alert.id.desc())
         alerts = session.exec(stmt).all()
     return templates.TemplateResponse("index.html", {"request": request, "alerts": alerts})
 
@@ -176,7 +214,7 @@ def api_alerts():
     try:
         load_result = load_alerts_from_json("alerts.json")
         with Session(engine) as session:
-            stmt = select(Alert).order_by(Alert.time.desc())
+            stmt = select(Alert).order_by(Alert.time.desc(), Alert.id.desc())
             alerts = session.exec(stmt).all()
             return [a.dict() for a in alerts]
     except Exception as e:
@@ -189,21 +227,40 @@ def alerts_nearby(lat: float = Query(...), lng: float = Query(...), radius_km: f
     try:
         load_alerts_from_json("alerts.json")
         with Session(engine) as session:
-            stmt = select(Alert)
+            # cheap bounding-box pre-filter in SQL (uses ix_alert_lat_lng), exact haversine in numpy;
+            # the box must contain the whole spherical circle, so it is a superset of the exact result
+            R = 6371.0
+            ang = radius_km / R  # angular radius (radians)
+            dlat = math.degrees(ang)
+            stmt = select(Alert.id, Alert.lat, Alert.lng).where(Alert.lat.between(lat - dlat, lat + dlat))
+            cos_lat = math.cos(math.radians(lat))
+            covers_pole = lat + dlat >= 90.0 or lat - dlat <= -90.0 or math.sin(ang) >= cos_lat
+            dlng = None if covers_pole or ang >= math.pi / 2 else math.degrees(math.asin(math.sin(ang) / cos_lat))
+            if dlng is not None and -180.0 <= lng - dlng and lng + dlng <= 180.0:
+                stmt = stmt.where(Alert.lng.between(lng - dlng, lng + dlng))
+            else:
+                # circle covers a pole or wraps the antimeridian: only filter on latitude
+                stmt = stmt.where(Alert.lng.is_not(None))
+            coords = session.exec(stmt).all()
+            if not coords:
+                return []
+            ids = np.fromiter((r.id for r in coords), dtype=np.int64, count=len(coords))
+            lats = np.fromiter((r.lat for r in coords), dtype=np.float64, count=len(coords))
+            lngs = np.fromiter((r.lng for r in coords), dtype=np.float64, count=len(coords))
+            dist = haversine_km_np(lat, lng, lats, lngs)
+            mask = dist <= radius_km
+            if not mask.any():
+                return []
+            distances = dict(zip(ids[mask].tolist(), dist[mask].tolist()))
+
+            stmt = select(Alert).where(Alert.id.in_(list(distances))).order_by(Alert.id)
             alerts = session.exec(stmt).all()
 
         nearby = []
         for a in alerts:
-            if a.lat is None or a.lng is None:
-                continue
-            try:
-                dist = haversine_km(lat, lng, a.lat, a.lng)
-            except Exception:
-                continue
-            if dist <= radius_km:
-                row = a.dict()
-                row["distance_km"] = round(dist, 2)
-                nearby.append(row)
+            row = a.dict()
+            row["distance_km"] = round(distances[a.id], 2)
+            nearby.append(row)
         return nearby
     except Exception as e:
         set_last_error(e)
@@ -212,7 +269,7 @@ def alerts_nearby(lat: float = Query(...), lng: float = Query(...), radius_km: f
 @app.get("/reload")
 def reload_json():
     """Manual reload: load alerts.json into DB and return summary."""
-    res = load_alerts_from_json("alerts.json")
+    res = load_alerts_from_json("alerts.json", force=True)
     return res
 
 @app.get("/refresh-alerts")
@@ -236,7 +293,7 @@ def refresh_alerts():
             }, status_code=500)
         
         # Now reload the alerts from the updated JSON file
-        load_result = load_alerts_from_json("alerts.json")
+        load_result = load_alerts_from_json("alerts.json", force=True)
         logger.info("Successfully refreshed alerts from scraper")
         
         # Don't expose internal error details to users
@@ -286,7 +343,7 @@ def db_view(request: Request):
     except Exception:
         pass
     with Session(engine) as session:
-        stmt = select(Alert).order_by(Alert.time.desc())
+        stmt = select(Alert).order_by(Alert.time.desc(), Alert.id.desc())
         alerts = session.exec(stmt).all()
     return templates.TemplateResponse("db_view.html", {"request": request, "alerts": alerts, "columns": None, "rows": None})
 
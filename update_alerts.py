@@ -8,48 +8,41 @@ Usage:
 """
 
 import sys
-import subprocess
+import asyncio
+
+from incois_scraper import INCOISScraper, save_alerts
 
 def main():
     print("=" * 60)
     print("Taranगिनी - Alert Update Script")
     print("=" * 60)
     print()
-    
+
     try:
-        # Run the scraper
+        # Run the scraper in-process
         print("Running INCOIS scraper...")
-        result = subprocess.run(
-            [sys.executable, "incois_scraper.py"],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if result.returncode == 0:
-            print("✅ Scraper completed successfully!")
-            print()
-            print("Output:")
-            print(result.stdout)
-            
-            if result.stderr:
-                print("\nWarnings/Errors:")
-                print(result.stderr)
-                
-            print()
-            print("=" * 60)
-            print("✅ Alerts have been updated in alerts.json")
-            print("The web server will automatically load the new alerts.")
-            print("=" * 60)
-            return 0
-        else:
-            print("❌ Scraper failed!")
-            print("\nError output:")
-            print(result.stderr)
+        scraper = INCOISScraper()
+        alerts = asyncio.run(scraper.fetch_incois_alerts())
+
+        if not alerts:
+            print("❌ Scraper returned no alerts!")
             return 1
-            
-    except subprocess.TimeoutExpired:
-        print("❌ Scraper timed out (>120 seconds)")
+
+        save_alerts(alerts, "alerts.json")
+
+        print("✅ Scraper completed successfully!")
+        print()
+        print(f"📊 {len(alerts)} alerts saved "
+              f"({scraper.alerts_processed} processed, {scraper.alerts_skipped} skipped)")
+        print()
+        print("=" * 60)
+        print("✅ Alerts have been updated in alerts.json")
+        print("The web server will automatically load the new alerts.")
+        print("=" * 60)
+        return 0
+
+    except KeyboardInterrupt:
+        print("\n⚠️ Process interrupted by user")
         return 1
     except Exception as e:
         print(f"❌ Error running scraper: {e}")